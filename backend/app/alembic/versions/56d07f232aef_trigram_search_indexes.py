@@ -0,0 +1,43 @@
+"""trigram search indexes
+
+Revision ID: 56d07f232aef
+Revises: d4fe4405e8dc
+Create Date: 2026-10-15 22:40:12.318457
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '56d07f232aef'
+down_revision: Union[str, None] = 'd4fe4405e8dc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_goals_name_trgm',
+        'goals',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_goals_description_trgm',
+        'goals',
+        ['description'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'description': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_goals_description_trgm', table_name='goals')
+    op.drop_index('ix_goals_name_trgm', table_name='goals')
@@ -0,0 +1,31 @@
+"""goals created_at id index
+
+Revision ID: 8b3e5f0c2a41
+Revises: 56d07f232aef
+Create Date: 2026-10-15 23:05:47.602114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3e5f0c2a41'
+down_revision: Union[str, None] = '56d07f232aef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_goals_created_at_id',
+        'goals',
+        ['created_at', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_goals_created_at_id', table_name='goals')
@@ -0,0 +1,46 @@
+"""goals search tsv
+
+Revision ID: c71d94e6b0f3
+Revises: 8b3e5f0c2a41
+Create Date: 2026-10-15 23:31:09.418236
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71d94e6b0f3'
+down_revision: Union[str, None] = '8b3e5f0c2a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'goals',
+        sa.Column(
+            'search_tsv',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_goals_search_tsv',
+        'goals',
+        ['search_tsv'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_goals_search_tsv', table_name='goals')
+    op.drop_column('goals', 'search_tsv')
@@ -0,0 +1,38 @@
+"""users lower indexes
+
+Revision ID: e2a9c4d7f815
+Revises: c71d94e6b0f3
+Create Date: 2026-10-16 00:12:38.905531
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9c4d7f815'
+down_revision: Union[str, None] = 'c71d94e6b0f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_users_email_lower',
+        'users',
+        [sa.text('lower(email)')],
+        unique=True,
+    )
+    op.create_index(
+        'ix_users_username_lower',
+        'users',
+        [sa.text('lower(username)')],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_username_lower', table_name='users')
+    op.drop_index('ix_users_email_lower', table_name='users')
@@ -0,0 +1,83 @@
+from collections import OrderedDict
+from functools import lru_cache
+import logging
+import time
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_redis_client(redis_url):
+    """
+    Lazily create and cache the Redis client.
+
+    Args:
+        redis_url (str): Redis connection URL
+
+    Returns:
+        redis.asyncio.Redis: Shared Redis client backed by a connection pool
+    """
+    logger.info("Creating Redis client")
+    return Redis.from_url(redis_url, decode_responses=True)
+
+
+def get_redis() -> Redis:
+    """
+    Dependency injection function for the Redis client.
+
+    Returns:
+        redis.asyncio.Redis: Shared Redis client
+    """
+    from .config import REDIS_URL
+
+    return get_redis_client(REDIS_URL)
+
+
+class TTLCache:
+    """
+    Small in-process LRU cache whose entries expire after a fixed TTL.
+
+    Entries are local to the worker process, so callers must only store
+    values that are safe to serve slightly stale for up to ``ttl`` seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        """
+        Return the cached value for key, or None if missing or expired.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value) -> None:
+        """
+        Store value under key, evicting the least recently used entry when full.
+        """
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drop every cached entry.
+        """
+        self._data.clear()
+
+
+# Encoded live-search payloads keyed by (query, page, page_size);
+# cleared whenever a goal is created, updated or deleted
+search_cache = TTLCache(maxsize=1024, ttl=5)
@@ -6,6 +6,8 @@ load_dotenv()
 
 
 SECRET_KEY = os.getenv("AUTH_SECRET_KEY")
+# Encoded once for JWT signing instead of on every encode/decode
+SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8") if SECRET_KEY else None
 ALGORITHM = os.getenv("ALGORITHM")
 FRONTEND_URL = os.getenv("QR_CODE_URL")
 CORS_ALLOW_ORIGINS = os.getenv("CORS_ALLOW_ORIGINS", "").split(",")
@@ -16,6 +18,9 @@ CORS_ALLOW_ORIGINS = [origin.strip() for origin in CORS_ALLOW_ORIGINS if origin.
 if "http://localhost:5173" not in CORS_ALLOW_ORIGINS:
     CORS_ALLOW_ORIGINS.append("http://localhost:5173")
 DATABASE_URL = os.getenv("DATABASE_URL")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# bcrypt cost factor; calibrated to the host at startup when unset
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS")) if os.getenv("BCRYPT_ROUNDS") else None
 URL = os.getenv("URL")
 KEY = os.getenv("KEY")
 BUCKET = os.getenv("BUCKET")
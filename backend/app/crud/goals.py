@@ -1,8 +1,9 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Optional
 
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 
 from app.models.goals import Goal
@@ -22,7 +23,7 @@ async def read_all_goals(db: Session, user_id: int) -> list:
     Returns:
         List of GoalRead objects
     """
-    goals = db.query(Goal).filter(Goal.user_id == user_id).all()
+    goals = db.scalars(select(Goal).where(Goal.user_id == user_id)).all()
     return goals
 
 
@@ -38,11 +39,9 @@ async def read_goal_by_id(goal_id: int, user_id: int, db: Session) -> dict:
     Returns:
         Goal object or None if not found
     """
-    goal = (
-        db.query(Goal)
-        .filter(Goal.id == goal_id, Goal.user_id == user_id)
-        .first()
-    )
+    goal = db.scalars(
+        select(Goal).where(Goal.id == goal_id, Goal.user_id == user_id)
+    ).first()
     if not goal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -88,11 +87,9 @@ async def update_goal(
         Updated GoalRead object or None if not found
     """
     try:
-        goal = (
-            db.query(Goal)
-            .filter(Goal.id == goal_id, Goal.user_id == user_id)
-            .first()
-        )
+        goal = db.scalars(
+            select(Goal).where(Goal.id == goal_id, Goal.user_id == user_id)
+        ).first()
 
         if not goal:
             return None
@@ -123,11 +120,9 @@ async def delete_goal(goal_id: int, user_id: int, db: Session) -> bool:
         True if goal was deleted, False otherwise
     """
     try:
-        goal = (
-            db.query(Goal)
-            .filter(Goal.id == goal_id, Goal.user_id == user_id)
-            .first()
-        )
+        goal = db.scalars(
+            select(Goal).where(Goal.id == goal_id, Goal.user_id == user_id)
+        ).first()
 
         if not goal:
             return False
@@ -143,20 +138,45 @@ async def delete_goal(goal_id: int, user_id: int, db: Session) -> bool:
 
 async def get_goal_by_id(db: Session, goal_id: int):
     """
-    Retrieve a specific goal by its ID with its related motivations.
+    Retrieve a specific goal by its ID.
     ...
     """
     try:
-        # Query the database to find the goal by ID with joined motivations
-        goal = (
-            db.query(Goal)
-            .options(
-                joinedload(Goal.motivation)
-            )  # Eager load the singular motivation
-            .filter(Goal.id == goal_id)
-            .first()
+        # Query the database to find the goal by ID
+        goal = db.scalars(select(Goal).where(Goal.id == goal_id)).first()
+
+        # If no goal is found, raise a 404 error
+        if not goal:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Goal with ID {goal_id} not found",
+            )
+
+        return goal
+
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred while retrieving the goal:{e}.",
         )
 
+
+async def get_goal_by_id_with_motivations(db: Session, goal_id: int):
+    """
+    Retrieve a specific goal by its ID with its related motivations.
+
+    Motivations are loaded with one extra batched SELECT (selectinload)
+    instead of a lazy load on first access.
+    ...
+    """
+    try:
+        goal = db.scalars(
+            select(Goal)
+            .options(selectinload(Goal.motivation))
+            .where(Goal.id == goal_id)
+        ).first()
+
         # If no goal is found, raise a 404 error
         if not goal:
             raise HTTPException(
@@ -175,10 +195,7 @@ async def get_goal_by_id(db: Session, goal_id: int):
 
 
 async def get_user_id_by_goal_id(goal_id: int, db):
-    goal = db.query(Goal).filter(Goal.id == goal_id).first()
-    if not goal:
-        return None
-    return goal.user_id
+    return db.scalar(select(Goal.user_id).where(Goal.id == goal_id))
 
 
 # TODO: verify if the goal belongs to the user
@@ -203,11 +220,9 @@ async def get_goal_for_qr_generation(
     """
     try:
         # Fetch the goal with a direct filter on both goal and user_id
-        goal = (
-            db.query(Goal)
-            .filter(Goal.id == goal_id, Goal.user_id == user_id)
-            .first()
-        )
+        goal = db.scalars(
+            select(Goal).where(Goal.id == goal_id, Goal.user_id == user_id)
+        ).first()
 
         # Check if goal exists
         if not goal:
@@ -245,11 +260,9 @@ async def validate_qr_access(goal_id: int, user_id: int, db: Session) -> Goal:
     """
     try:
         # Fetch the goal with a direct filter on both goal and user_id
-        goal = (
-            db.query(Goal)
-            .filter(Goal.id == goal_id, Goal.user_id == user_id)
-            .first()
-        )
+        goal = db.scalars(
+            select(Goal).where(Goal.id == goal_id, Goal.user_id == user_id)
+        ).first()
 
         # Check if goal exists
         if not goal:
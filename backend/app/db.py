@@ -29,6 +29,7 @@ def get_engine(database_url):
         max_overflow=5,  # Extra connections when pool is full
         pool_timeout=30,  # Wait time for a connection before raising an error
         pool_recycle=1800,
+        query_cache_size=1200,  # Compiled SQL cache entries (default 500)
     )
     logger.info(
         f"Database engine creation took {time.time() - start_time:.2f} seconds"
@@ -58,6 +59,7 @@ class DatabaseSessionManager:
 
     _engine = None
     _SessionLocal = None
+    _ReadonlySessionLocal = None
 
     @classmethod
     def initialize(cls, database_url):
@@ -69,6 +71,13 @@ class DatabaseSessionManager:
         """
         cls._engine = get_engine(database_url)
         cls._SessionLocal = get_session_factory(cls._engine)
+        # Not scoped: read-only sessions must never be shared with requests
+        # that write on the same thread
+        cls._ReadonlySessionLocal = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=cls._engine.execution_options(postgresql_readonly=True),
+        )
 
     @classmethod
     def get_session(cls) -> Session:
@@ -84,6 +93,20 @@ class DatabaseSessionManager:
             cls.initialize(DATABASE_URL)
         return cls._SessionLocal()
 
+    @classmethod
+    def get_readonly_session(cls) -> Session:
+        """
+        Get a new, unshared database session whose connection is READ ONLY.
+
+        Returns:
+            sqlalchemy.orm.Session: A new read-only database session
+        """
+        if cls._ReadonlySessionLocal is None:
+            from .config import DATABASE_URL
+
+            cls.initialize(DATABASE_URL)
+        return cls._ReadonlySessionLocal()
+
     @classmethod
     @contextmanager
     def session_scope(cls):
@@ -116,3 +139,17 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_readonly_db():
+    """
+    Dependency injection function for read-only database sessions.
+
+    Yields:
+        sqlalchemy.orm.Session: A dedicated read-only database session
+    """
+    db = DatabaseSessionManager.get_readonly_session()
+    try:
+        yield db
+    finally:
+        db.close()
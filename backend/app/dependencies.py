@@ -1,8 +1,11 @@
 from fastapi import Depends
+from redis.asyncio import Redis
 from sqlalchemy.orm import Session
 from typing import Annotated, Iterator
 
+from .cache import get_redis
 from .db import get_db as get_db_session
+from .db import get_readonly_db as get_readonly_db_session
 from app.models.users import Base
 from app.services.security import get_current_user
 
@@ -36,6 +39,30 @@ def get_db() -> Iterator[Session]:
 db_dependency = Annotated[Session, Depends(get_db)]
 
 
+# Read-only database dependency
+def get_readonly_db() -> Iterator[Session]:
+    """
+    Dependency for endpoints that never write. The session is dedicated to
+    the request and its connection is READ ONLY, so PostgreSQL can skip
+    write bookkeeping without affecting sessions that write.
+    """
+    db_generator = get_readonly_db_session()
+    try:
+        db = next(db_generator)
+        yield db
+    finally:
+        try:
+            next(db_generator)
+        except StopIteration:
+            pass
+
+readonly_db_dependency = Annotated[Session, Depends(get_readonly_db)]
+
+
+# Redis dependency
+redis_dependency = Annotated[Redis, Depends(get_redis)]
+
+
 # User dependency
 user_dependency = Annotated[dict, Depends(get_current_user)]
 
@@ -46,7 +73,7 @@ async def qr_token_dependency(token: str, db: Session = Depends(get_db)):
     """
     try:
         # Decode the token
-        payload = decode_token(token)
+        payload = await decode_token(token)
 
         # Validate token type
         if payload.get("type") != "qr_verification":
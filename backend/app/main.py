@@ -1,7 +1,8 @@
 import time
 import logging
 import sys
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.gzip import GZipMiddleware
 from fastapi.routing import APIRouter
@@ -45,6 +46,7 @@ app = FastAPI(
         "url": "https://opensource.org/licenses/MIT",
     },
     terms_of_service="https://sataplan.com/terms",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -53,6 +55,26 @@ app.add_middleware(
 )
 
 
+# Largest request body accepted; leaves room for a 5MB cover image plus the
+# other form fields
+MAX_REQUEST_BODY_SIZE = 6 * 1024 * 1024
+
+
+@app.middleware("http")
+async def limit_request_body(request: Request, call_next):
+    # Reject oversized uploads before they are parsed and spooled
+    content_length = request.headers.get("content-length")
+    if (
+        content_length
+        and content_length.isdigit()
+        and int(content_length) > MAX_REQUEST_BODY_SIZE
+    ):
+        return ORJSONResponse(
+            status_code=413, content={"detail": "Request body is too large"}
+        )
+    return await call_next(request)
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[*CORS_ALLOW_ORIGINS],
@@ -94,3 +116,20 @@ versioned_router.include_router(
 app.include_router(versioned_router)
 
 logger.info(f"Total FastAPI app initialization took {time.time() - startup_start:.2f} seconds")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop and httptools are the fast paths for the event loop and HTTP
+    # parsing; websockets backs the live search endpoint
+    # Pass the app object itself; an import string would load this module a
+    # second time, since it is already running as __main__
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+    )
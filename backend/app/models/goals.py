@@ -3,15 +3,17 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy import (
     Column,
+    Computed,
     Date,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     String,
     func,
 )
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy_utils import URLType
 
 from app.db import Base
@@ -23,6 +25,25 @@ if TYPE_CHECKING:
 
 class Goal(Base):
     __tablename__ = "goals"
+    __table_args__ = (
+        # Trigram indexes let the live search's ILIKE '%q%' use an index
+        Index(
+            "ix_goals_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_goals_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+        # Serves the live search's keyset pagination order
+        Index("ix_goals_created_at_id", "created_at", "id"),
+        # Full-text index for multi-word live search queries
+        Index("ix_goals_search_tsv", "search_tsv", postgresql_using="gin"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(80), index=True, nullable=False)
     description = Column(String, index=True)
@@ -37,6 +58,16 @@ class Goal(Base):
         index=True,
     )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Maintained by PostgreSQL; deferred so regular goal loads skip it
+    search_tsv = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, ''))",
+                persisted=True,
+            ),
+        )
+    )
 
     # Use a string for the relationship to avoid circular imports
     user = relationship("User", back_populates="goal", lazy="joined")
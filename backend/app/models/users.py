@@ -7,6 +7,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     String,
     func,
 )
@@ -31,6 +32,12 @@ class User(Base):
     is_first_login = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Case-insensitive lookups used by login and signup
+        Index("ix_users_email_lower", func.lower(email), unique=True),
+        Index("ix_users_username_lower", func.lower(username), unique=True),
+    )
+
     profile = relationship(
         "Profile",
         back_populates="user",
@@ -1,14 +1,14 @@
 import logging
 from datetime import datetime, timezone
 
+import jwt
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from jose import jwt
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_, func, or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload, selectinload
 
-from app.config import SECRET_KEY, ALGORITHM
+from app.config import SECRET_KEY_BYTES, ALGORITHM
 from app.dependencies import db_dependency, user_dependency
 from app.models.users import Profile, User
 from app.schemas.users import (
@@ -68,16 +68,17 @@ async def create_user(user: UserCreate, db: db_dependency) -> dict:
     """
     try:
         # Optimize user existence check using a single query
+        # Usernames and emails are unique regardless of case
         existing_user_stmt = select(User).where(
             or_(
-                User.username == user.username,
-                User.email == user.email
+                func.lower(User.username) == user.username.lower(),
+                func.lower(User.email) == user.email.lower()
             )
         )
         existing_user = db.scalars(existing_user_stmt).first()
 
         if existing_user:
-            if existing_user.username == user.username:
+            if existing_user.username.lower() == user.username.lower():
                 logger.warning(
                     f"Signup attempt with existing username: {user.username}"
                 )
@@ -86,7 +87,7 @@ async def create_user(user: UserCreate, db: db_dependency) -> dict:
                     detail="Username already exists",
                 )
 
-            if existing_user.email == user.email:
+            if existing_user.email.lower() == user.email.lower():
                 logger.warning(f"Signup attempt with existing email: {user.email}")
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -158,21 +159,13 @@ async def login(
     try:
         logger.info(f"Login attempt for: {form_data.username}")
 
-        # Use a single query to fetch user by username or email
-        user_stmt = select(User).where(
-            or_(
-                User.username == form_data.username,
-                User.email == form_data.username
-            )
-        )
-        user = db.scalars(user_stmt).first()
-
-        # Authenticate user
-        if not user or not await authenticate_user(
+        # authenticate_user looks the user up in one query and checks the password
+        user = await authenticate_user(
             username_or_email=form_data.username,
             password=form_data.password,
             db=db,
-        ):
+        )
+        if not user:
             logger.warning(f"Failed login attempt: {form_data.username}")
             raise AuthenticationError("Invalid credentials")
 
@@ -221,13 +214,13 @@ async def refresh_token(refresh_token: str, db: db_dependency) -> TokenResponse:
     try:
         # Decode and validate refresh token
         try:
-            payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = jwt.decode(refresh_token, SECRET_KEY_BYTES, algorithms=[ALGORITHM])
         except jwt.ExpiredSignatureError:
             logger.warning("Expired refresh token")
             raise AuthenticationError(
                 "Refresh token has expired. Please log in again."
             )
-        except jwt.JWTError:
+        except jwt.InvalidTokenError:
             logger.warning("Invalid JWT token")
             raise AuthenticationError("Invalid refresh token")
 
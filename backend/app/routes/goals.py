@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from datetime import datetime
 from typing import Annotated, List, Optional
@@ -7,12 +8,15 @@ from fastapi import APIRouter, BackgroundTasks, File, Form, HTTPException, Uploa
 from pydantic import ValidationError
 from sqlalchemy import select, and_, func
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.orm import Session, selectinload, joinedload
+from starlette.concurrency import run_in_threadpool
 
+from app.cache import search_cache
 from app.dependencies import db_dependency, user_dependency
 from app.models import Goal, Motivation
 from app.schemas.goals import GoalRead, GoalUpdate
 from app.services.uploadimg import Uploader
+from app.utils.supabas import supabase_remove
 from app.utils.goal import Status
 
 # Configure logging
@@ -77,15 +81,18 @@ SUPPORTED_IMAGE_FORMATS = {
 }
 
 
-async def async_upload_image(cover_image: UploadFile) -> str:
+async def async_upload_image(
+    cover_image: UploadFile,
+) -> tuple[str, str, asyncio.Future]:
     """
-    Asynchronously upload image to storage with robust error handling.
+    Validate an image and start uploading it to storage.
 
     Args:
         cover_image (UploadFile): Image file to upload
 
     Returns:
-        str: URL of the uploaded image
+        tuple[str, str, asyncio.Future]: URL the image will be served from,
+            its object path in storage, and the pending upload
     """
     try:
         # Validate file presence
@@ -96,9 +103,7 @@ async def async_upload_image(cover_image: UploadFile) -> str:
             )
 
         # Validate file size and type using existing Uploader logic
-        image_url = await Uploader(cover_image)
-
-        return image_url
+        return await Uploader(cover_image)
 
     except HTTPException:
         raise
@@ -110,6 +115,19 @@ async def async_upload_image(cover_image: UploadFile) -> str:
         )
 
 
+def save_goal(db: Session, goal: Goal):
+    """
+    Insert a goal in its own transaction.
+
+    Args:
+        db (Session): Database session
+        goal (Goal): Goal to insert
+    """
+    db.add(goal)
+    db.commit()
+    db.refresh(goal)
+
+
 @router.post("/add", status_code=status.HTTP_201_CREATED)
 async def create_goal(
     background_tasks: BackgroundTasks,
@@ -176,8 +194,10 @@ async def create_goal(
                     detail="Invalid due date format. Use YYYY-MM-DD"
                 )
 
-        # Upload image
-        image_url = await async_upload_image(cover_image)
+        # Start the image upload
+        image_url, image_filename, upload_task = await async_upload_image(
+            cover_image
+        )
 
         # Create goal with efficient database operation
         goal = Goal(
@@ -189,18 +209,50 @@ async def create_goal(
             cover_image=image_url,
         )
 
-        # Use a single transaction for goal creation
-        try:
-            db.add(goal)
-            db.commit()
-            db.refresh(goal)
-        except IntegrityError as ie:
+        # Insert the goal while the image upload is still in flight
+        upload_result, insert_result = await asyncio.gather(
+            upload_task,
+            run_in_threadpool(save_goal, db, goal),
+            return_exceptions=True,
+        )
+
+        if isinstance(insert_result, BaseException) and not isinstance(
+            upload_result, BaseException
+        ):
+            # No row will reference the uploaded image; remove it
+            try:
+                await supabase_remove(image_filename)
+            except Exception as e:
+                logger.error(
+                    f"Failed to remove orphaned cover image "
+                    f"{image_filename}: {str(e)}"
+                )
+
+        if isinstance(insert_result, IntegrityError):
             db.rollback()
-            logger.error(f"Database integrity error: {str(ie)}")
+            logger.error(f"Database integrity error: {str(insert_result)}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Goal creation failed due to data constraints"
             )
+        if isinstance(insert_result, BaseException):
+            db.rollback()
+            raise insert_result
+
+        if isinstance(upload_result, BaseException):
+            # The row points at an image that never arrived; remove it
+            try:
+                db.delete(goal)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(
+                    f"Failed to remove goal {goal.id} after its cover image "
+                    f"upload failed: {str(e)}"
+                )
+            raise upload_result
+
+        search_cache.clear()
 
         logger.info(
             f"Goal created successfully. ID: {goal.id}, User ID: {user_id}"
@@ -389,6 +441,7 @@ async def update_goal(
 
         # Commit changes
         db.commit()
+        search_cache.clear()
         db.refresh(goal)
 
         logger.info(
@@ -453,6 +506,7 @@ async def delete_goal(
         # Delete the goal
         db.delete(goal)
         db.commit()
+        search_cache.clear()
 
         logger.info(
             f"Goal deleted successfully. Goal ID: {goal_id}, User ID: {user_id}"
@@ -1,28 +1,131 @@
 import logging
-from typing import Optional
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, HTTPException, Response, status
+from fastapi import APIRouter, Header, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import load_only
 
 from app.crud.goals import read_goal_by_id
-from app.dependencies import db_dependency, user_dependency
+from app.dependencies import (
+    db_dependency,
+    readonly_db_dependency,
+    redis_dependency,
+    user_dependency,
+)
 from app.models import Goal, Motivation
 from app.schemas.motivations import MotivationCreate
+from app.services.idempotency import cache_response, get_cached_response
+
+from uuid import UUID, uuid4
+from sqlalchemy import (
+    Text,
+    and_,
+    bindparam,
+    cast,
+    delete,
+    false,
+    func,
+    literal_column,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+import random
+
+# Fraction of expected validation-failure warnings to emit
+WARNING_SAMPLE_RATE = 0.01
+
+
+class SampleFilter(logging.Filter):
+    """Emit only a sample of WARNING records; other levels pass through."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno == logging.WARNING:
+            return random.random() < WARNING_SAMPLE_RATE
+        return True
 
-from uuid import UUID
-from sqlalchemy import select, and_, or_, false
-import traceback
 
 # Configure logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Expected client mistakes (empty or duplicate motivations) are sampled on a
+# child logger; authorization and operational warnings stay on ``logger``
+validation_logger = logger.getChild("validation")
+validation_logger.addFilter(SampleFilter())
+
 router = APIRouter(
     prefix="/motivations",
     tags=["motivations"],
 )
 
+# Hot-path statements are built once at import and executed with bound
+# parameters, so requests skip Core expression construction.
+
+# Insert only if the goal belongs to the user; unique indexes on
+# quote/link reject duplicates without a pre-SELECT
+_INSERT_OWNED_MOTIVATION = (
+    pg_insert(Motivation)
+    .from_select(
+        ["id", "quote", "link", "goal_id"],
+        select(
+            bindparam("id", type_=Motivation.id.type),
+            bindparam("quote", type_=Motivation.quote.type),
+            bindparam("link", type_=Motivation.link.type),
+            Goal.id,
+        ).where(
+            Goal.id == bindparam("goal_id"),
+            Goal.user_id == bindparam("user_id"),
+        ),
+    )
+    .on_conflict_do_nothing()
+    .returning(Motivation.id)
+)
+
+# Let PostgreSQL build the JSON array; rows never become ORM objects
+_MOTIVATIONS_JSON_BY_GOAL = (
+    select(
+        cast(
+            func.coalesce(
+                func.json_agg(
+                    func.json_build_object(
+                        "id",
+                        Motivation.id,
+                        "link",
+                        Motivation.link,
+                        "quote",
+                        Motivation.quote,
+                        "goal_id",
+                        Motivation.goal_id,
+                    )
+                ),
+                literal_column("'[]'::json"),
+            ),
+            Text,
+        ),
+        func.count(Motivation.id),
+    )
+    .select_from(Motivation)
+    .join(Goal, Motivation.goal_id == Goal.id)
+    .where(
+        Goal.id == bindparam("goal_id"),
+        Goal.user_id == bindparam("user_id"),
+    )
+)
+
+# Delete the motivation only if its goal belongs to the user
+_DELETE_OWNED_MOTIVATION = (
+    delete(Motivation)
+    .where(
+        Motivation.id == bindparam("motivation_id"),
+        Motivation.goal_id.in_(
+            select(Goal.id).where(Goal.user_id == bindparam("user_id"))
+        ),
+    )
+    .returning(Motivation.id)
+    .execution_options(synchronize_session=False)
+)
+
 
 class AuthorizationError(HTTPException):
     """Custom exception for authorization-related errors."""
@@ -67,30 +170,45 @@ def validate_user(user: Optional[dict]) -> int:
     return user_id
 
 
-def get_user_goal(db, goal_id: int, user_id: int):
+def raise_for_duplicate_motivation(db, quote: Optional[str], link_str: Optional[str]):
     """
-    Retrieve a Goal for a specific user.
+    Work out which field collided after an INSERT ... ON CONFLICT skipped a row.
 
     Args:
         db: Database session
-        goal_id (int): Goal ID
-        user_id (int): User ID
-
-    Returns:
-        Goal: Retrieved Goal
+        quote (Optional[str]): Quote that was being inserted
+        link_str (Optional[str]): Link that was being inserted
 
     Raises:
-        ValidationError: If Goal is not found
+        ValidationError: Always, naming the duplicated field when found
     """
-    goal = db.query(Goal).filter(Goal.id == goal_id).first()
+    predicates = []
+    if quote:
+        predicates.append(Motivation.quote == quote)
+    if link_str:
+        predicates.append(Motivation.link == link_str)
 
-    if not goal:
-        logger.warning(
-            f"Goal not found for user. Goal ID: {goal_id}, User ID: {user_id}"
-        )
-        raise ValidationError(f"Goal with ID {goal_id} not found for this user")
+    existing_quote = None
+    existing_link = None
+
+    if predicates:
+        for existing in db.scalars(
+            select(Motivation).where(or_(*predicates)).limit(2)
+        ).all():
+            if quote and existing.quote == quote:
+                existing_quote = existing
+            if link_str and str(existing.link) == link_str:
+                existing_link = existing
+
+    if existing_quote:
+        validation_logger.warning("Duplicate quote", extra={"quote": quote})
+        raise ValidationError("Motivation quote already exists")
 
-    return goal
+    if existing_link:
+        validation_logger.warning("Duplicate link", extra={"link": link_str})
+        raise ValidationError("Motivation link already exists")
+
+    raise ValidationError("Motivation already exists")
 
 
 @router.post("/{goal_id}", status_code=status.HTTP_201_CREATED)
@@ -99,6 +217,8 @@ async def add_motivation(
     db: db_dependency,
     user: user_dependency,
     data: MotivationCreate,
+    redis: redis_dependency,
+    idempotency_key: Annotated[Optional[str], Header()] = None,
 ):
     """
     Create a new motivation for a specific Goal. Accepts quote, link, or both.
@@ -106,6 +226,8 @@ async def add_motivation(
     Args:
         goal_id: UUID of the goal to associate with
         data: Motivation data including quote and optional link
+        idempotency_key: Optional Idempotency-Key header; retries with the
+            same key replay the first response without touching the database
 
     Returns:
         JSON response with success message and motivation ID
@@ -114,106 +236,100 @@ async def add_motivation(
         HTTPException: For authorization, validation, or server errors
     """
     user_id = None
+    goal_id_s = goal_id.hex  # Formatted once for log records
+    debug = logger.isEnabledFor(logging.DEBUG)
 
     try:
-        logger.debug(
-            "Starting motivation creation process",
-            extra={
-                "goal_id": str(goal_id),
-                "quote": data.quote,
-                "link": str(data.link) if data.link else "None",
-                "user": user,
-            },
-        )
+        if debug:
+            logger.debug(
+                "Starting motivation creation process",
+                extra={
+                    "goal_id": goal_id_s,
+                    "quote": data.quote,
+                    "link": data.link_str,
+                    "user": user,
+                },
+            )
 
         user_id = validate_user(user)
-        logger.debug("User validated", extra={"user_id": user_id})
+        if debug:
+            logger.debug("User validated", extra={"user_id": user_id})
 
         if not user_id:
             logger.warning("User validation failed")
             raise AuthorizationError("Invalid user credentials")
 
-        goal = db.scalars(
-            select(Goal)
-            .where(and_(Goal.id == goal_id, Goal.user_id == user_id))
-            .limit(1)
-        ).first()
-
-        if not goal:
-            logger.warning(
-                "Goal not found or unauthorized",
-                extra={"goal_id": str(goal_id), "user_id": user_id},
-            )
-            raise AuthorizationError("Goal not found or access denied")
-
-        logger.debug(
-            "Goal retrieved",
-            extra={"goal_id": str(goal.id), "goal_user_id": goal.user_id},
+        idempotency_scope = f"POST /motivations/{goal_id}"
+        cached = await get_cached_response(
+            redis, user_id, idempotency_scope, idempotency_key
         )
+        if cached:
+            return ORJSONResponse(
+                status_code=cached["status_code"], content=cached["content"]
+            )
 
         if not data.quote and not data.link:
-            logger.warning("Empty quote and link")
+            validation_logger.warning("Empty quote and link")
             raise ValidationError(
                 "At least one of quote or link must be provided"
             )
 
-        link_str = str(data.link) if data.link else None
+        link_str = data.link_str
 
-        # 🧠 Separate checks for existing quote/link
-        existing_quote = None
-        existing_link = None
-
-        if data.quote:
-            existing_quote = db.scalars(
-                select(Motivation)
-                .where(Motivation.quote == data.quote)
-                .limit(1)
-            ).first()
-
-        if link_str:
-            existing_link = db.scalars(
-                select(Motivation).where(Motivation.link == link_str).limit(1)
-            ).first()
-
-        logger.debug(
-            "Existence check complete",
-            extra={
-                "existing_quote": (
-                    existing_quote.quote if existing_quote else None
-                ),
-                "existing_link": existing_link.link if existing_link else None,
+        motivation_id = db.execute(
+            _INSERT_OWNED_MOTIVATION,
+            {
+                "id": uuid4(),
+                "quote": data.quote,
+                "link": link_str,
+                "goal_id": goal_id,
+                "user_id": user_id,
             },
-        )
+        ).scalar()
 
-        if existing_quote:
-            logger.warning("Duplicate quote", extra={"quote": data.quote})
-            raise ValidationError("Motivation quote already exists")
+        if motivation_id is None:
+            db.rollback()
 
-        if existing_link:
-            logger.warning("Duplicate link", extra={"link": link_str})
-            raise ValidationError("Motivation link already exists")
+            # Nothing inserted: either the goal is not the user's or a
+            # quote/link already exists
+            owned_goal_id = db.scalar(
+                select(Goal.id).where(
+                    Goal.id == goal_id, Goal.user_id == user_id
+                )
+            )
+            if owned_goal_id is None:
+                logger.warning(
+                    "Goal not found or unauthorized",
+                    extra={"goal_id": goal_id_s, "user_id": user_id},
+                )
+                raise AuthorizationError("Goal not found or access denied")
 
-        motivation = Motivation(
-            quote=data.quote, link=link_str, goal_id=goal.id
-        )
+            raise_for_duplicate_motivation(db, data.quote, link_str)
 
-        db.add(motivation)
         db.commit()
-        db.refresh(motivation)
 
         logger.info(
             "Motivation created",
             extra={
-                "motivation_id": motivation.id,
+                "motivation_id": motivation_id,
                 "goal_id": goal_id,
                 "user_id": user_id,
             },
         )
 
-        return {
+        response = {
             "message": "Motivation created successfully",
-            "motivation_id": str(motivation.id),
+            "motivation_id": str(motivation_id),
         }
+        await cache_response(
+            redis,
+            user_id,
+            idempotency_scope,
+            idempotency_key,
+            status.HTTP_201_CREATED,
+            response,
+        )
+        return response
 
     except AuthorizationError as e:
         logger.warning(
@@ -222,7 +338,6 @@ async def add_motivation(
                 "goal_id": goal_id,
                 "user_id": user_id,
                 "error": str(e),
-                "traceback": traceback.format_exc(),
             },
         )
         raise HTTPException(
@@ -230,13 +345,12 @@ async def add_motivation(
         )
 
     except ValidationError as e:
-        logger.warning(
+        validation_logger.warning(
             "Validation error",
             extra={
                 "goal_id": goal_id,
                 "user_id": user_id,
                 "error": str(e),
-                "traceback": traceback.format_exc(),
             },
         )
         raise HTTPException(
@@ -245,13 +359,12 @@ async def add_motivation(
 
     except SQLAlchemyError as e:
         db.rollback()
-        logger.error(
+        logger.exception(
             "DB error",
             extra={
                 "goal_id": goal_id,
                 "user_id": user_id,
                 "error": str(e),
-                "traceback": traceback.format_exc(),
             },
         )
         raise HTTPException(
@@ -263,27 +376,31 @@ async def add_motivation(
         db.rollback()
         logger.critical(
             "Unexpected error",
+            exc_info=True,
             extra={
                 "goal_id": goal_id,
                 "user_id": user_id,
                 "error": str(e),
-                "traceback": traceback.format_exc(),
                 "user_data": str(user),
-                "input_data": {"quote": data.quote, "link": link_str},
+                "input_data": {"quote": data.quote, "link": data.link_str},
             },
         )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while creating motivation",
+        )
 
 
 @router.get("/{goal_id}")
 async def get_motivations_by_goal(
-    goal_id: UUID, db: db_dependency, user: user_dependency
-) -> dict:
+    goal_id: UUID, db: readonly_db_dependency, user: user_dependency
+) -> Response:
     """
     Retrieve all motivations for a specific Goal.
 
     Args:
         goal_id: UUID of the goal to retrieve motivations for
-        db: Database session
+        db: Read-only database session
         user: User authentication data
 
     Returns:
@@ -299,43 +416,22 @@ async def get_motivations_by_goal(
         # Verify the Goal exists and belongs to the user
         goal = await read_goal_by_id(goal_id, user_id, db)
 
-        # Retrieve motivations for the Goal
-        motivations = db.scalars(
-            select(Motivation)
-            .join(Goal)
-            .where(Goal.id == goal_id, Goal.user_id == user_id)
-            .options(
-                load_only(
-                    Motivation.id,
-                    Motivation.link,
-                    Motivation.quote,
-                    Motivation.goal_id,
-                )
-            )
-        ).all()
-
-        # Construct the response
-        response = [
-            {
-                "id": m.id,
-                "link": m.link,
-                "quote": m.quote,
-                "goal_id": goal.id,
-            }
-            for m in motivations
-        ]
+        motivations_json, count = db.execute(
+            _MOTIVATIONS_JSON_BY_GOAL, {"goal_id": goal_id, "user_id": user_id}
+        ).one()
 
         # Add a check for empty motivations
-        if not response:
+        if not count:
             logger.info(f"No motivations found for Goal ID: {goal.id}")
-            return {"data": []}
+        else:
+            logger.info(f"Retrieved {count} motivations for Goal ID: {goal.id}")
 
-        logger.info(
-            f"Retrieved {len(response)} motivations for Goal ID: {goal.id}"
+        return Response(
+            content=f'{{"data":{motivations_json}}}',
+            media_type="application/json",
         )
-        return {"data": response}
 
-    except (ValidationError, AuthorizationError) as e:
+    except HTTPException as e:
         raise e
 
     except Exception as e:
@@ -348,7 +444,11 @@ async def get_motivations_by_goal(
 
 @router.delete("/{motivation_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_motivation(
-    motivation_id: UUID, db: db_dependency, user: user_dependency
+    motivation_id: UUID,
+    db: db_dependency,
+    user: user_dependency,
+    redis: redis_dependency,
+    idempotency_key: Annotated[Optional[str], Header()] = None,
 ):
     """
     Delete a specific motivation.
@@ -357,6 +457,8 @@ async def delete_motivation(
         motivation_id (UUID): The ID of the motivation to delete
         db (db_dependency): Database session
         user (user_dependency): User authentication data
+        redis (redis_dependency): Redis client
+        idempotency_key (Optional[str]): Optional Idempotency-Key header
 
     Returns:
         Response: No content on success
@@ -370,30 +472,41 @@ async def delete_motivation(
         # Validate user and get user ID
         user_id = validate_user(user)
 
-        # Retrieve the motivation and ensure it belongs to the user
-        motivation = (
-            db.query(Motivation)
-            .join(Goal)
-            .filter(Motivation.id == motivation_id, Goal.user_id == user_id)
-            .first()
+        idempotency_scope = f"DELETE /motivations/{motivation_id}"
+        cached = await get_cached_response(
+            redis, user_id, idempotency_scope, idempotency_key
         )
+        if cached:
+            return Response(status_code=cached["status_code"])
 
-        if not motivation:
-            logger.warning(
-                f"Motivation deletion attempt failed. "
-                f"Motivation ID: {motivation_id}, User ID: {user_id}"
-            )
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Motivation with ID {motivation_id} not found or not authorized",
-            )
-
-        # Delete the motivation
-        db.delete(motivation)
-
+        # Delete the motivation only if its goal belongs to the user
         try:
+            deleted = db.execute(
+                _DELETE_OWNED_MOTIVATION,
+                {"motivation_id": motivation_id, "user_id": user_id},
+            ).scalar()
+
+            if deleted is None:
+                db.rollback()
+                logger.warning(
+                    f"Motivation deletion attempt failed. "
+                    f"Motivation ID: {motivation_id}, User ID: {user_id}"
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Motivation with ID {motivation_id} not found or not authorized",
+                )
+
             db.commit()
             logger.info(f"Motivation deleted successfully. ID: {motivation_id}")
+            await cache_response(
+                redis,
+                user_id,
+                idempotency_scope,
+                idempotency_key,
+                status.HTTP_204_NO_CONTENT,
+                None,
+            )
             return Response(status_code=status.HTTP_204_NO_CONTENT)
 
         except SQLAlchemyError as db_error:
@@ -407,8 +520,8 @@ async def delete_motivation(
                 detail="Database error occurred while deleting motivation",
             )
 
-    except (ValidationError, AuthorizationError) as auth_error:
-        raise auth_error
+    except HTTPException as http_error:
+        raise http_error
 
     except Exception as e:
         logger.error(f"Unexpected error during motivation deletion: {str(e)}")
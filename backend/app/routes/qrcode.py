@@ -1,21 +1,26 @@
 import datetime
+import hashlib
+import hmac
+import json
 import logging
 import re
 import secrets
-from typing import Any, Dict, Optional
+import time
+from typing import Optional
 
 from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
-from app.config import FRONTEND_URL
+from app.config import FRONTEND_URL, SECRET_KEY_BYTES
 from app.crud.goals import (
     get_goal_by_id,
+    get_goal_by_id_with_motivations,
     get_user_id_by_goal_id,
 )
 from app.crud.users import (
     get_user_pass_by_id,
 )
-from app.dependencies import db_dependency, user_dependency
+from app.dependencies import db_dependency, redis_dependency, user_dependency
 from app.schemas.goals import GoalRead
 from app.services.qrcode import generate_qrcode
 from app.services.security import (
@@ -29,8 +34,29 @@ from uuid import UUID
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# Add global goal_PASSWORDS dictionary
-goal_PASSWORDS: Dict[int, Dict[str, Any]] = {}
+# Goal passwords live in Redis so every worker sees them and they expire
+QR_PASSWORD_TTL = 900  # 15 minutes in seconds
+
+
+# Successful bcrypt checks are remembered briefly so QR scan retries skip it
+QR_VERIFIED_TTL = 60  # seconds
+
+
+def _qr_password_key(goal_id) -> str:
+    return f"qr:pw:{goal_id}"
+
+
+def _hash_goal_password(password: str) -> str:
+    # Only this digest is stored, never the plaintext password
+    return hashlib.blake2b(password.encode(), digest_size=16).hexdigest()
+
+
+def _qr_verified_key(goal_id, password: str) -> str:
+    # Keyed with the server secret: the key name holds a digest of the
+    # owner's account password, which must not be crackable offline by
+    # anyone able to list Redis keys
+    digest = hmac.new(SECRET_KEY_BYTES, password.encode(), "sha256").hexdigest()
+    return f"qr:verified:{goal_id}:{digest}"
 
 
 class AuthorizationError(HTTPException):
@@ -84,7 +110,10 @@ router = APIRouter(
 
 @router.get("/generate-permanent-qr/{goal_id}")
 async def generate_permanent_qrcode(
-    user: user_dependency, db: db_dependency, goal_id: UUID
+    user: user_dependency,
+    db: db_dependency,
+    redis: redis_dependency,
+    goal_id: UUID,
 ):
     """
     Generate a permanent QR code for a specific goal with a unique password.
@@ -93,6 +122,7 @@ async def generate_permanent_qrcode(
         user (user_dependency): Authenticated user
         goal_id (UUID): ID of the goal to generate QR code for
         db (db_dependency): Database session
+        redis (redis_dependency): Redis client holding goal passwords
 
     Returns:
         StreamingResponse: QR code image with goal password in header
@@ -104,7 +134,7 @@ async def generate_permanent_qrcode(
     try:
         # Validate user and get user ID
         user_id = validate_user(user)
-        logger.debug(f"Authenticated User ID: {user_id}")
+        logger.debug("Authenticated User ID: %s", user_id)
 
         # Verify the goal exists and belongs to the user
         goal = await get_goal_by_id(db, goal_id)
@@ -113,9 +143,10 @@ async def generate_permanent_qrcode(
             logger.warning(f"Goal not found: {goal_id}")
             raise ValidationError("Goal not found")
 
-        logger.debug(f"Goal details: {goal}")
-        logger.debug(f"Goal user_id: {goal.user_id}")
-        logger.debug(f"Authenticated user_id: {user_id}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Goal details: %s", goal)
+            logger.debug("Goal user_id: %s", goal.user_id)
+            logger.debug("Authenticated user_id: %s", user_id)
 
         # Ensure the goal belongs to the authenticated user
         if str(goal.user_id) != str(user_id):
@@ -135,11 +166,17 @@ async def generate_permanent_qrcode(
         )  # 8 characters of URL-safe random bytes
 
         # Store the goal password with additional context
-        goal_PASSWORDS[goal_id] = {
-            "password": goal_password,
-            "user_id": user_id,
-            "created_at": datetime.datetime.utcnow(),
-        }
+        await redis.set(
+            _qr_password_key(goal_id),
+            json.dumps(
+                {
+                    "password_hash": _hash_goal_password(goal_password),
+                    "user_id": str(user_id),
+                    "created_at": int(time.time()),
+                }
+            ),
+            ex=QR_PASSWORD_TTL,
+        )
 
         # Construct the verification URL with goal_id
         verification_url = f"{FRONTEND_URL}/?goal_id={goal_id}"
@@ -179,17 +216,23 @@ async def generate_permanent_qrcode(
 
 
 @router.post("/verify-goal-access")
-async def verify_goal_access(goal_id: UUID, password: str, db: db_dependency):
+async def verify_goal_access(
+    goal_id: UUID, password: str, db: db_dependency, redis: redis_dependency
+):
     """
     Verify the goal-specific password and user ownership.
 
+    The password generated alongside the QR code is checked first; the
+    goal owner's account password is still accepted as a fallback.
+
     Args:
         goal_id (UUID): ID of the goal to verify
         password (str): Password to verify
         db (db_dependency): Database session
+        redis (redis_dependency): Redis client holding goal passwords
 
     Returns:
-        JSONResponse: Access token if verification is successful
+        ORJSONResponse: Access token if verification is successful
 
     Raises:
         ValidationError: If the goal is not found
@@ -198,7 +241,7 @@ async def verify_goal_access(goal_id: UUID, password: str, db: db_dependency):
     try:
         # Check if the goal exists
         goal = await get_goal_by_id(db, goal_id)
-        logger.debug(f"Goal fetched: {goal}")  # Log the goal object
+        logger.debug("Goal fetched: %s", goal)  # Log the goal object
 
         if not goal:
             logger.warning(f"Attempt to access non-existent goal: {goal_id}")
@@ -210,13 +253,27 @@ async def verify_goal_access(goal_id: UUID, password: str, db: db_dependency):
             f"Verifying goal access. goal ID: {goal_id}, User ID: {user_id}"
         )
 
-        # Get user's hashed password
-        hashed_password = await get_user_pass_by_id(user_id, db)
+        # Check the goal-specific password generated with the QR code
+        stored = await redis.get(_qr_password_key(goal_id))
+        password_hash = json.loads(stored)["password_hash"] if stored else None
+
+        if password_hash is None or not hmac.compare_digest(
+            _hash_goal_password(password), password_hash
+        ):
+            verified_key = _qr_verified_key(goal_id, password)
+
+            if not await redis.get(verified_key):
+                # Get user's hashed password
+                hashed_password = await get_user_pass_by_id(user_id, db)
+
+                # Verify password
+                if not await verify_password(password, hashed_password):
+                    logger.warning(
+                        f"Invalid access attempt for goal ID: {goal_id}"
+                    )
+                    raise AuthorizationError("Invalid access credentials")
 
-        # Verify password
-        if not await verify_password(password, hashed_password):
-            logger.warning(f"Invalid access attempt for goal ID: {goal_id}")
-            raise AuthorizationError("Invalid access credentials")
+                await redis.setex(verified_key, QR_VERIFIED_TTL, "1")
 
         # Generate access token
         access_token = await create_access_token_for_qrcode(
@@ -230,7 +287,7 @@ async def verify_goal_access(goal_id: UUID, password: str, db: db_dependency):
 
         logger.info(f"Access token generated for goal ID: {goal_id}")
 
-        return JSONResponse(status_code=200, content={"token": access_token})
+        return ORJSONResponse(status_code=200, content={"token": access_token})
 
     except ValidationError as e:
         logger.error(f"Validation error: {str(e)}")
@@ -265,14 +322,14 @@ async def view_goal(
         db (db_dependency): Database session
 
     Returns:
-        JSONResponse: Goal details or error message
+        ORJSONResponse: Goal details or error message
 
     Raises:
         AuthorizationError: If token is invalid
     """
     try:
         # Decode and verify the token
-        payload = decode_token(token)
+        payload = await decode_token(token)
 
         # Validate token type
         allowed_types = ["permanent_qr_access", "qr_onetime"]
@@ -286,11 +343,11 @@ async def view_goal(
             logger.warning("Token missing goal_id")
             raise AuthorizationError("Invalid token")
 
-        # Fetch the goal
-        goal_details = await get_goal_by_id(db, goal_id)
+        # Fetch the goal together with its motivations
+        goal_details = await get_goal_by_id_with_motivations(db, goal_id)
 
         logger.info(f"Goal details retrieved. goal ID: {goal_id}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "goal_id": goal_details.id.hex,  # Convert UUID to hex string
@@ -314,7 +371,7 @@ async def view_goal(
 
     except AuthorizationError as e:
         logger.warning(f"Access denied: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=401,
             content={
                 "error": "Access Denied",
@@ -325,7 +382,7 @@ async def view_goal(
 
     except Exception as e:
         logger.error(f"Unexpected error viewing goal: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"error": "An unexpected error occurred"},
         )
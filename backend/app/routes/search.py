@@ -1,63 +1,278 @@
 import asyncio
-import json
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from fastapi.responses import HTMLResponse
+from sqlalchemy import (
+    Text,
+    bindparam,
+    cast,
+    func,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.cache import search_cache
 from app.dependencies import db_dependency
 from app.models.goals import Goal
-from app.schemas.goals import GoalRead
 
 router = APIRouter(prefix="/search", tags=["search"])
 
 
+# Mirrors the fields of GoalRead
+_SEARCH_COLUMNS = (
+    Goal.id,
+    Goal.user_id,
+    Goal.name,
+    Goal.description,
+    Goal.status,
+    Goal.due_date,
+    Goal.created_at,
+    Goal.cover_image,
+)
+# Substring match served by the trigram indexes; suits single words typed
+# one keystroke at a time
+_TRIGRAM_MATCH = or_(
+    Goal.name.ilike(bindparam("pattern")),
+    Goal.description.ilike(bindparam("pattern")),
+)
+# Word match served by the search_tsv GIN index for multi-word queries
+_FULL_TEXT_MATCH = Goal.search_tsv.op("@@")(
+    func.plainto_tsquery("english", bindparam("query"))
+)
+_AFTER_CURSOR = tuple_(Goal.created_at, Goal.id) < tuple_(
+    bindparam("after_created_at"), bindparam("after_id")
+)
+
+
+def _search_statement(full_text: bool, after_cursor: bool):
+    page = select(*_SEARCH_COLUMNS).where(
+        _FULL_TEXT_MATCH if full_text else _TRIGRAM_MATCH
+    )
+    if after_cursor:
+        page = page.where(_AFTER_CURSOR)
+    page = (
+        page.order_by(Goal.created_at.desc(), Goal.id.desc())
+        .limit(bindparam("limit"))
+        .subquery("g")
+    )
+
+    # PostgreSQL encodes the page itself, so it comes back as one JSON string
+    return select(
+        cast(
+            func.coalesce(
+                func.json_agg(
+                    aggregate_order_by(
+                        page.table_valued(),
+                        page.c.created_at.desc(),
+                        page.c.id.desc(),
+                    )
+                ),
+                literal_column("'[]'::json"),
+            ),
+            Text,
+        )
+    )
+
+
+# Built once so SQLAlchemy compiles each statement a single time;
+# keyed by (full_text, after_cursor)
+_SEARCH_GOALS = {
+    (full_text, after_cursor): _search_statement(full_text, after_cursor)
+    for full_text in (False, True)
+    for after_cursor in (False, True)
+}
+
+
+def search_goals(
+    db: Session,
+    query: str,
+    after: Optional[tuple[datetime, UUID]],
+    page_size: int,
+) -> str:
+    """
+    Fetch goals whose name or description matches the query.
+
+    Results are ordered newest first and paginated by keyset: the next page
+    starts strictly after the (created_at, id) of the last row the client
+    received, so deep pages cost the same as the first one.
+
+    Multi-word queries use PostgreSQL full-text search; single words keep
+    the substring (ILIKE) match so partially typed words still hit.
+
+    Only the columns exposed by GoalRead are selected, and PostgreSQL
+    aggregates them into a JSON array, so no Python objects are built per row.
+
+    Args:
+        db (Session): Database session
+        query (str): Search text
+        after (Optional[tuple[datetime, UUID]]): Cursor of the last row
+            already sent, or None for the first page
+        page_size (int): Number of results per page
+
+    Returns:
+        str: JSON array of the goals on the requested page
+    """
+    full_text = len(query.split()) > 1
+    params = {"limit": page_size}
+    if full_text:
+        params["query"] = query
+    else:
+        params["pattern"] = f"%{query}%"
+    if after is not None:
+        params["after_created_at"], params["after_id"] = after
+
+    stmt = _SEARCH_GOALS[full_text, after is not None]
+    return db.execute(stmt, params).scalar_one()
+
+
+def parse_cursor(after: Optional[dict]) -> Optional[tuple[datetime, UUID]]:
+    """
+    Convert the client's ``after`` cursor into a (created_at, id) tuple.
+
+    Args:
+        after (Optional[dict]): ``{"created_at": ..., "id": ...}`` taken from
+            the last result the client received
+
+    Returns:
+        Optional[tuple[datetime, UUID]]: Parsed cursor, or None for the first page
+
+    Raises:
+        ValueError: If the cursor values are malformed
+    """
+    if not after:
+        return None
+    return datetime.fromisoformat(after["created_at"]), UUID(after["id"])
+
+
+async def fetch_search_payload(
+    db: Session,
+    query: str,
+    after: Optional[tuple[datetime, UUID]],
+    page_size: int,
+) -> str:
+    """
+    Run one search and return its encoded JSON results.
+
+    Args:
+        db (Session): Database session owned by the connection
+        query (str): Search text
+        after (Optional[tuple[datetime, UUID]]): Keyset cursor, or None for
+            the first page
+        page_size (int): Number of results per page
+
+    Returns:
+        str: JSON array of GoalRead objects
+    """
+    # Key on exactly the text the query runs with, so a cache hit always
+    # returns the rows that query would have produced
+    query = query.strip()
+    key = (query, after, page_size)
+    payload = search_cache.get(key)
+    if payload is not None:
+        return payload
+
+    # Run the blocking query in a worker thread so other sockets keep
+    # being served while it waits on the database
+    search = asyncio.ensure_future(
+        run_in_threadpool(search_goals, db, query, after, page_size)
+    )
+    try:
+        payload = await asyncio.shield(search)
+    except asyncio.CancelledError:
+        # The thread cannot be interrupted; hold on until it finishes so the
+        # session is not closed underneath it
+        await asyncio.wait({search})
+        raise
+
+    search_cache.set(key, payload)
+    return payload
+
+
+async def receive_queries(websocket: WebSocket, queue: asyncio.Queue):
+    """
+    Read search messages into a single-slot queue, replacing any query the
+    consumer has not picked up yet.
+
+    Args:
+        websocket (WebSocket): Client connection
+        queue (asyncio.Queue): Queue with maxsize=1 shared with answer_queries
+    """
+    while True:
+        message = await websocket.receive_text()
+
+        search = None
+        if message.strip():
+            # Parse the message for query, cursor, and page size. The
+            # cursor is the created_at and id of the last result received.
+            data = orjson.loads(message)
+            search = (
+                data.get("query", ""),
+                parse_cursor(data.get("after")),
+                data.get("page_size", 3),
+            )
+
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(search)
+
+
+async def answer_queries(websocket: WebSocket, db: Session, queue: asyncio.Queue):
+    """
+    Answer queued searches one at a time on the connection's session.
+
+    Args:
+        websocket (WebSocket): Client connection
+        db (Session): Database session owned by the connection
+        queue (asyncio.Queue): Queue filled by receive_queries
+    """
+    while True:
+        search = await queue.get()
+        payload = await fetch_search_payload(db, *search) if search else "[]"
+
+        # A newer query arrived while this one ran; its answer supersedes ours
+        if not queue.empty():
+            continue
+
+        # Sent as text because clients JSON.parse the frame
+        await websocket.send_text(payload)
+
+
 @router.websocket("/ws/search")
 async def websocket_search(websocket: WebSocket, db: db_dependency):
     await websocket.accept()
 
-    try:
-        while True:
-            message = await websocket.receive_text()
-            if message.strip():
-                # Parse the message for query, page, and page size
-                data = json.loads(message)
-                query = data.get("query", "")
-                page = data.get("page", 1)
-                page_size = data.get("page_size", 3)
-
-                # Fetch goals based on the search query with pagination
-                goals = (
-                    db.query(Goal)
-                    .filter(
-                        Goal.name.ilike(f"%{query}%")
-                        | Goal.description.ilike(f"%{query}%")
-                    )
-                    .offset((page - 1) * page_size)  # Skip the previous pages
-                    .limit(page_size)  # Limit the number of results
-                    .all()
-                )
-
-                # Convert Goal objects to dictionaries for better readability
-                result = []
-                for goal in goals:
-                    goal_dict = GoalRead.from_orm(goal).dict()
-                    # Convert any datetime fields to ISO format strings
-                    for key, value in goal_dict.items():
-                        if hasattr(value, "isoformat"):
-                            goal_dict[key] = value.isoformat()
-                    result.append(goal_dict)
-
-                await websocket.send_json(result)
-            else:
-                await websocket.send_json([])
-            await asyncio.sleep(0.2)
-    except WebSocketDisconnect:
-        print("Connection closed")
+    # Only the latest keystroke matters: the reader keeps at most one
+    # pending query and the single worker never runs obsolete ones
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    tasks = {
+        asyncio.create_task(receive_queries(websocket, queue)),
+        asyncio.create_task(answer_queries(websocket, db, queue)),
+    }
 
+    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    for task in pending:
+        task.cancel()
+    # Let a cancelled search release the session before it is closed
+    await asyncio.gather(*pending, return_exceptions=True)
 
-@router.get("/live-search", response_class=HTMLResponse)
-async def live_search_page():
-    return """
+    for task in done:
+        if isinstance(task.exception(), WebSocketDisconnect):
+            print("Connection closed")
+        elif task.exception():
+            raise task.exception()
+
+
+# Encoded once at import; the page is static
+LIVE_SEARCH_PAGE = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -66,7 +281,7 @@ async def live_search_page():
         <title>Live Search</title>
         <script>
     let socket = new WebSocket("ws://localhost:8000/search/ws/search");
-    let currentPage = 1;
+    let after = null; // created_at and id of the last result, for the next page
     const pageSize = 10; // Number of results per page
 
     socket.onopen = function() {
@@ -98,7 +313,7 @@ async def live_search_page():
         const query = document.getElementById("searchInput").value;
         const data = {
             query: query,
-            page: currentPage,
+            after: after,
             page_size: pageSize
         };
         socket.send(JSON.stringify(data));
@@ -131,4 +346,10 @@ async def live_search_page():
         <div id="results"></div>
     </body>
     </html>
-    """
+    """.encode("utf-8")
+LIVE_SEARCH_HEADERS = {"content-length": str(len(LIVE_SEARCH_PAGE))}
+
+
+@router.get("/live-search", response_class=HTMLResponse)
+async def live_search_page():
+    return HTMLResponse(content=LIVE_SEARCH_PAGE, headers=LIVE_SEARCH_HEADERS)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, Field, FutureDate, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, FutureDate, HttpUrl
 
 from app.utils.goal import Status
 
@@ -34,7 +34,5 @@ class GoalRead(GoalBase):
     due_date: datetime
     cover_image: str
 
-    class Config:
-        from_attributes = True
-        arbitrary_types_allowed = True
-        json_encoders = {Status: lambda v: v.value}
+    # Status is a str Enum, so JSON-mode dumps already emit its value
+    model_config = ConfigDict(from_attributes=True, arbitrary_types_allowed=True)
@@ -1,7 +1,15 @@
+from functools import cached_property
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, HttpUrl, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    HttpUrl,
+    computed_field,
+    model_validator,
+)
 
 
 class MotivationCreate(BaseModel):
@@ -9,6 +17,8 @@ class MotivationCreate(BaseModel):
     Schema for creating a new motivation.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     quote: Optional[str] = Field(
         None,
         min_length=0,
@@ -30,6 +40,12 @@ class MotivationCreate(BaseModel):
             )
         return values
 
+    @computed_field
+    @cached_property
+    def link_str(self) -> Optional[str]:
+        """Normalized link as a string, computed once per instance."""
+        return str(self.link) if self.link else None
+
 
 class MotivationRead(BaseModel):
     id: UUID
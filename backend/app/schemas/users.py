@@ -4,6 +4,25 @@ from uuid import UUID
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
+# Password strength checks, compiled once at import
+UPPERCASE_RE = re.compile(r"[A-Z]")
+LOWERCASE_RE = re.compile(r"[a-z]")
+DIGIT_RE = re.compile(r"\d")
+SPECIAL_CHAR_RE = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
+
+RESERVED_USERNAMES = frozenset({"admin", "root", "system", "support"})
+COMMON_PASSWORDS = frozenset({"password", "12345678", "qwerty", "admin"})
+# Disposable email domains to block
+DISPOSABLE_DOMAINS = frozenset(
+    {
+        "temp-mail.org",
+        "tempmail.com",
+        "throwawaymail.com",
+        "guerrillamail.com",
+        "mailinator.com",
+    }
+)
+
 
 class UserBase(BaseModel):
     username: str = Field(
@@ -22,8 +41,7 @@ class UserBase(BaseModel):
         - Prevents reserved usernames
         - Ensures no consecutive special characters
         """
-        reserved_usernames = ["admin", "root", "system", "support"]
-        if username.lower() in reserved_usernames:
+        if username.lower() in RESERVED_USERNAMES:
             raise ValueError("This username cannot be used")
 
         return username
@@ -48,30 +66,29 @@ class UserCreate(UserBase):
         - At least one special character
         """
         # Check for at least one uppercase letter
-        if not re.search(r"[A-Z]", password):
+        if not UPPERCASE_RE.search(password):
             raise ValueError(
                 "Password must contain at least one uppercase letter"
             )
 
         # Check for at least one lowercase letter
-        if not re.search(r"[a-z]", password):
+        if not LOWERCASE_RE.search(password):
             raise ValueError(
                 "Password must contain at least one lowercase letter"
             )
 
         # Check for at least one number
-        if not re.search(r"\d", password):
+        if not DIGIT_RE.search(password):
             raise ValueError("Password must contain at least one number")
 
         # Check for at least one special character
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        if not SPECIAL_CHAR_RE.search(password):
             raise ValueError(
                 "Password must contain at least one special character"
             )
 
         # Check for common weak passwords
-        common_passwords = ["password", "12345678", "qwerty", "admin"]
-        if password.lower() in common_passwords:
+        if password.lower() in COMMON_PASSWORDS:
             raise ValueError("This password is too common and not secure")
 
         return password
@@ -83,19 +100,10 @@ class UserCreate(UserBase):
         - Prevents disposable email domains
         - Ensures email is properly formatted
         """
-        # List of disposable email domains to block
-        disposable_domains = [
-            "temp-mail.org",
-            "tempmail.com",
-            "throwawaymail.com",
-            "guerrillamail.com",
-            "mailinator.com",
-        ]
-
         # Extract domain from email
-        domain = email.split("@")[-1].lower()
+        domain = email.rpartition("@")[2].lower()
 
-        if domain in disposable_domains:
+        if domain in DISPOSABLE_DOMAINS:
             raise ValueError("Disposable email addresses are not allowed")
 
         return email
@@ -0,0 +1,71 @@
+import json
+import logging
+from typing import Any, Optional
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_TTL = 24 * 3600  # 24 hours in seconds
+
+
+def _idempotency_key(user_id, scope: str, key: str) -> str:
+    # Scoped by method and resource so a reused key on another endpoint
+    # never replays this one's response
+    return f"idem:{user_id}:{scope}:{key}"
+
+
+async def get_cached_response(
+    redis: Redis, user_id, scope: str, key: Optional[str]
+) -> Optional[dict[str, Any]]:
+    """
+    Look up the response stored for a previous request with the same key.
+
+    Args:
+        redis (Redis): Redis client
+        user_id: ID of the authenticated user
+        scope (str): HTTP method and resource path of the request
+        key (Optional[str]): Value of the Idempotency-Key header
+
+    Returns:
+        Optional[dict]: Stored status code and content, or None on a miss
+    """
+    if not key:
+        return None
+
+    cached = await redis.get(_idempotency_key(user_id, scope, key))
+    if cached is None:
+        return None
+
+    logger.info(f"Replaying idempotent response for key: {key}")
+    return json.loads(cached)
+
+
+async def cache_response(
+    redis: Redis,
+    user_id,
+    scope: str,
+    key: Optional[str],
+    status_code: int,
+    content: Any,
+) -> None:
+    """
+    Store a response so retries with the same key can be replayed.
+
+    Args:
+        redis (Redis): Redis client
+        user_id: ID of the authenticated user
+        scope (str): HTTP method and resource path of the request
+        key (Optional[str]): Value of the Idempotency-Key header
+        status_code (int): HTTP status code of the response
+        content (Any): JSON-serializable response body
+    """
+    if not key:
+        return
+
+    await redis.set(
+        _idempotency_key(user_id, scope, key),
+        json.dumps({"status_code": status_code, "content": content}),
+        nx=True,
+        ex=IDEMPOTENCY_TTL,
+    )
@@ -7,6 +7,7 @@ from qrcode.image.styles.moduledrawers.pil import (
 from qrcode.image.styles.colormasks import (
     RadialGradiantColorMask,
 )
+from functools import lru_cache
 from pathlib import Path
 from io import BytesIO
 from typing import Optional
@@ -41,24 +42,48 @@ async def generate_qrcode(
         BytesIO: QR code image as a byte stream
     """
     try:
-        r = qrcode.QRCode(error_correction=error_correction)
-        r.add_data(data)
-
-        img = r.make_image(
-            image_factory=StyledPilImage,
-            module_drawer=module_drawer,
-            color_mask=color_mask,
-            embeded_image_path=embedded_image_path,
+        png = _render_qrcode_png(
+            data,
+            error_correction,
+            module_drawer,
+            color_mask,
+            embedded_image_path,
         )
 
-        # Save image to a BytesIO object
-        img_byte_arr = BytesIO()
-        img.save(img_byte_arr, format="PNG")
-        img_byte_arr.seek(0)
-
         logger.info(f"QR code generated successfully for data: {data[:20]}...")
-        return img_byte_arr
+        # Fresh stream per call; the cached bytes are never mutated
+        return BytesIO(png)
 
     except Exception as e:
         logger.error(f"Error generating QR code: {str(e)}")
         raise
+
+
+@lru_cache(maxsize=256)
+def _render_qrcode_png(
+    data: str,
+    error_correction: int,
+    module_drawer,
+    color_mask,
+    embedded_image_path: Optional[str],
+) -> bytes:
+    """
+    Render a styled QR code to PNG bytes.
+
+    The output is deterministic for a given set of arguments, so results
+    are memoized and repeat requests for the same URL skip PIL encoding.
+    """
+    r = qrcode.QRCode(error_correction=error_correction)
+    r.add_data(data)
+
+    img = r.make_image(
+        image_factory=StyledPilImage,
+        module_drawer=module_drawer,
+        color_mask=color_mask,
+        embeded_image_path=embedded_image_path,
+    )
+
+    # Save image to a BytesIO object
+    img_byte_arr = BytesIO()
+    img.save(img_byte_arr, format="PNG")
+    return img_byte_arr.getvalue()
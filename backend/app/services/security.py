@@ -1,76 +1,162 @@
 from datetime import timedelta, datetime, timezone
+from functools import lru_cache
 from typing import Any, Annotated, Dict, Optional
 from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
-from app.config import ALGORITHM, SECRET_KEY
+from starlette.concurrency import run_in_threadpool
+from app.cache import TTLCache, get_redis
+from app.config import ALGORITHM, BCRYPT_ROUNDS, SECRET_KEY_BYTES
 from app.models.users import User
-from jose import JWTError, jwt, ExpiredSignatureError
+import jwt
+from jwt import ExpiredSignatureError, InvalidTokenError
+from sqlalchemy import func, or_, select
 from sqlalchemy.orm import Session
+import bcrypt
+import hashlib
 import logging
+import secrets
+import time
 import urllib.parse
 import uuid
 
 logger = logging.getLogger(__name__)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
+def calibrate_bcrypt_rounds(
+    target_ms: float = 150, min_rounds: int = 10, max_rounds: int = 14
+) -> int:
+    """
+    Pick the highest bcrypt cost whose hash time fits the target on this host.
 
-# In-memory token tracking (for demonstration, replace with a more robust solution in production)
-USED_TOKENS: dict[str, datetime] = {}
+    Each extra round doubles the work, so one timed hash at ``min_rounds`` is
+    enough to extrapolate the rest.
 
+    Args:
+        target_ms (float): Desired time for a single hash in milliseconds
+        min_rounds (int): Lowest cost ever returned
+        max_rounds (int): Highest cost ever returned
 
-def is_token_used(token_id: str) -> bool:
+    Returns:
+        int: Chosen bcrypt cost factor
     """
-    Check if a token has been used or expired.
+    start = time.perf_counter()
+    bcrypt.hashpw(b"calibration-password", bcrypt.gensalt(rounds=min_rounds))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed_ms * 2 <= target_ms:
+        rounds += 1
+        elapsed_ms *= 2
+    return rounds
+
+
+@lru_cache(maxsize=1)
+def get_bcrypt_cost() -> int:
+    """
+    Return the bcrypt cost factor, calibrating it on first use.
+
+    Deferred so importing this module (every worker, every tool that loads
+    the app) does not pay for a timed hash.
+
+    Returns:
+        int: BCRYPT_ROUNDS if set, otherwise the calibrated cost
+    """
+    cost = BCRYPT_ROUNDS or calibrate_bcrypt_rounds()
+    logger.info(f"Using bcrypt cost factor {cost}")
+    return cost
+
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
+
+# Verified token payloads keyed by a digest of the token
+DECODED_TOKENS = TTLCache(maxsize=10_000, ttl=60)
+
+async def claim_token(token_id: str, expires_at: int) -> bool:
+    """
+    Atomically mark a one-time token as used.
+
+    The marker lives in Redis until the token expires, so the check holds
+    across workers and never outlives the token.
 
     Args:
         token_id (str): Unique identifier for the token
+        expires_at (int): Token expiry as a Unix timestamp
 
     Returns:
-        bool: True if token is used or expired, False otherwise
+        bool: True if this call claimed the token, False if it was already used
     """
-    if token_id not in USED_TOKENS:
-        return False
+    redis = get_redis()
+    return bool(await redis.set(f"qr:used:{token_id}", 1, nx=True, exat=expires_at))
+
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
 
-    token_info = USED_TOKENS[token_id]
 
-    # Check if token is expired
-    if datetime.now(timezone.utc) > token_info["expiration"]:
-        del USED_TOKENS[token_id]
-        return False
+def get_cached_payload(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the payload of a recently verified token that has not expired.
+
+    Args:
+        token (str): Encoded JWT
 
-    return token_info["used"]
+    Returns:
+        Optional[Dict[str, Any]]: Cached payload, or None on a miss
+    """
+    payload = DECODED_TOKENS.get(_token_cache_key(token))
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+    return None
 
 
-def mark_token_used(token_id: str, expiration: datetime):
+def cache_payload(token: str, payload: Dict[str, Any]):
     """
-    Mark a token as used.
+    Remember a verified token payload.
+
+    One-time tokens are never cached, since every use must be checked.
 
     Args:
-        token_id (str): Unique identifier for the token
-        expiration (datetime): Expiration time of the token
+        token (str): Encoded JWT
+        payload (Dict[str, Any]): Its verified payload
     """
-    USED_TOKENS[token_id] = {"used": True, "expiration": expiration}
+    if not payload.get("one_time_use", False):
+        DECODED_TOKENS.set(_token_cache_key(token), payload)
+
+
+def _bcrypt_hash(password: str) -> str:
+    return bcrypt.hashpw(
+        password.encode(), bcrypt.gensalt(rounds=get_bcrypt_cost())
+    ).decode()
+
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash() -> bytes:
+    return _bcrypt_hash("dummy-password").encode()
+
+
+def _check_dummy_password(password: str) -> None:
+    bcrypt.checkpw(password.encode(), _dummy_password_hash())
 
 
 async def hash_password(password: str) -> str:
     """
     Hash a password using bcrypt.
 
+    bcrypt is CPU bound, so it runs in a worker thread to keep the event
+    loop free for other requests.
+
     Args:
         password (str): The password to hash
 
     Returns:
         str: The hashed password
     """
-    return pwd_context.hash(password)
+    return await run_in_threadpool(_bcrypt_hash, password)
 
 
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a plain password against a hashed password.
+    Verify a plain password against a hashed password in a worker thread.
 
     Args:
         plain_password (str): The plain password to verify
@@ -79,42 +165,9 @@ async def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if the passwords match, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def decode_token(token: str) -> dict:
-    """
-    Decode and verify a JWT token with more detailed error handling.
-
-    Args:
-        token (str): JWT token to decode
-
-    Returns:
-        dict: Decoded token payload
-
-    Raises:
-        HTTPException: If token is invalid, expired, or cannot be decoded
-    """
-    try:
-        # Decode the JWT token
-        # Attempt to handle URL-encoded tokens
-
-        token = urllib.parse.unquote(token)
-
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError as e:
-        # Handle invalid tokens
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Invalid token: {str(e)}",
-        )
-    except ExpiredSignatureError as e:
-        # Handling for tokens with invalid structure
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Invalid token structure: {str(e)}",
-        )
+    return await run_in_threadpool(
+        bcrypt.checkpw, plain_password.encode(), hashed_password.encode()
+    )
 
 
 # step 1: authenticate user
@@ -131,15 +184,22 @@ async def authenticate_user(username_or_email: str, password: str, db: Session):
         User or None: Authenticated user or None if authentication fails
     """
 
-    # Check if the input is an email or username based on the presence of '@'
-    if "@" in username_or_email:
-        user = db.query(User).filter(User.email == username_or_email).first()
-
-    else:
-        user = db.query(User).filter(User.username == username_or_email).first()
+    # Match either column in one query; the lower() indexes serve both legs.
+    # This also finds usernames that contain '@'.
+    identifier = username_or_email.lower()
+    user = db.scalars(
+        select(User).where(
+            or_(
+                func.lower(User.email) == identifier,
+                func.lower(User.username) == identifier,
+            )
+        )
+    ).first()
 
-    # If no user found, return None
+    # If no user found, still spend one bcrypt check so unknown accounts
+    # take as long as wrong passwords and cannot be told apart by timing
     if not user:
+        await run_in_threadpool(_check_dummy_password, password)
         return None
 
     # Verify password
@@ -169,6 +229,9 @@ async def create_access_token(username: str, user_id, plan_id: int = None):
     refresh_token_expires = timedelta(days=7)
 
     try:
+        # Both tokens share the same issue time
+        now = datetime.now(timezone.utc)
+
         # Convert user_id to string if it's a UUID
         user_id_str = str(user_id)
 
@@ -176,7 +239,7 @@ async def create_access_token(username: str, user_id, plan_id: int = None):
         access_token_payload = {
             "sub": username,  # Use username as sub
             "id": user_id_str,  # Convert to string for JSON serialization
-            "exp": datetime.now(timezone.utc) + access_token_expires,
+            "exp": now + access_token_expires,
         }
 
         # Add plan_id to payload if provided
@@ -185,7 +248,7 @@ async def create_access_token(username: str, user_id, plan_id: int = None):
 
         access_token = jwt.encode(
             access_token_payload,
-            SECRET_KEY,
+            SECRET_KEY_BYTES,
             algorithm=ALGORITHM,
         )
 
@@ -193,12 +256,12 @@ async def create_access_token(username: str, user_id, plan_id: int = None):
         refresh_token_payload = {
             "sub": username,
             "id": user_id_str,
-            "exp": datetime.now(timezone.utc) + refresh_token_expires,
+            "exp": now + refresh_token_expires,
         }
 
         refresh_token = jwt.encode(
             refresh_token_payload,
-            SECRET_KEY,
+            SECRET_KEY_BYTES,
             algorithm=ALGORITHM,
         )
 
@@ -215,7 +278,11 @@ async def create_access_token(username: str, user_id, plan_id: int = None):
 # step 3: get current user
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        # Repeat requests with the same token skip the signature check
+        payload = get_cached_payload(token)
+        if payload is None:
+            payload = jwt.decode(token, SECRET_KEY_BYTES, algorithms=[ALGORITHM])
+            cache_payload(token, payload)
         username: str = payload.get("sub")
         user_id: int = payload.get("id")
         if username is None or user_id is None:
@@ -227,7 +294,7 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
             "username": username,
             "id": user_id,
         }
-    except JWTError:
+    except InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="could not validate user",
@@ -255,18 +322,20 @@ async def create_access_token_for_qrcode(
         if isinstance(value, uuid.UUID):
             to_encode[key] = str(value)
 
+    # One-time tokens need an id so their first use can be claimed;
+    # 128 random bits in 22 URL-safe characters
+    if to_encode.get("one_time_use") and "token_id" not in to_encode:
+        to_encode["token_id"] = secrets.token_urlsafe(16)
+
     # Set expiration time
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=15)
+    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=15))
 
     # Add expiration to the payload
     to_encode.update({"exp": expire})
 
     # Encode the token
     try:
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        encoded_jwt = jwt.encode(to_encode, SECRET_KEY_BYTES, algorithm=ALGORITHM)
         return encoded_jwt
     except Exception as e:
         logger.error(f"Token generation error: {str(e)}")
@@ -276,7 +345,7 @@ async def create_access_token_for_qrcode(
         )
 
 
-def decode_token(token: str) -> Dict[str, Any]:
+async def decode_token(token: str) -> Dict[str, Any]:
     """
     Decode and validate a JWT token.
 
@@ -290,8 +359,18 @@ def decode_token(token: str) -> Dict[str, Any]:
         HTTPException: If token is invalid or has been used
     """
     try:
+        # JWTs never contain '%', so only URL-encoded tokens need unquoting
+        if "%" in token:
+            token = urllib.parse.unquote(token)
+
+        # Reuse a recent verification of the same token when possible
+        payload = get_cached_payload(token)
+        if payload is not None:
+            return payload
+
         # Decode the token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY_BYTES, algorithms=[ALGORITHM])
+        cache_payload(token, payload)
 
         # Check for one-time use token
         if payload.get("one_time_use", False):
@@ -302,28 +381,25 @@ def decode_token(token: str) -> Dict[str, Any]:
                     detail="Invalid token: missing token ID",
                 )
 
-            # Check if token has been used
-            if is_token_used(token_id):
+            # Claim the token; fails if it has been used before
+            if not await claim_token(token_id, payload["exp"]):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Token has already been used",
                 )
 
-            # Mark token as used if it's a one-time use token
-            mark_token_used(
-                token_id,
-                datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
-            )
-
         return payload
 
+    except HTTPException:
+        raise
+
     except ExpiredSignatureError:
         logger.warning("Token has expired")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired"
         )
 
-    except JWTError:
+    except InvalidTokenError:
         logger.warning("Invalid token")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
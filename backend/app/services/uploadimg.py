@@ -1,13 +1,17 @@
+import asyncio
+import os
 import uuid
-import magic
 from fastapi import HTTPException
 
-from app.super import supabase_upload_signed
+from app.utils.image import sniff_image_type
+from app.utils.supabas import get_public_url, supabase_upload_signed
 
 
 KB = 1024
 MB = 1024 * KB
 MAX_FILE_SIZE = 1 * MB  # 1MB limit
+MAX_COVER_IMAGE_SIZE = 5 * MB
+SNIFF_SIZE = 12  # Enough bytes to recognise every supported signature
 SUPPORTED_IMAGE_FORMATS = {
     "image/jpeg": "jpg",
     "image/png": "png",
@@ -15,26 +19,54 @@ SUPPORTED_IMAGE_FORMATS = {
 }
 
 
-async def Uploader(cover_image):
-    # Read the file content
-    content = await cover_image.read()
-    size = len(content)
+async def upload_size(upload) -> int:
+    """
+    Size of an upload in bytes, without reading it into memory.
 
+    Args:
+        upload (UploadFile): Uploaded file
+
+    Returns:
+        int: File size in bytes
+    """
+    if upload.size is not None:
+        return upload.size
+    size = upload.file.seek(0, os.SEEK_END)
+    await upload.seek(0)
+    return size
+
+
+async def Uploader(cover_image) -> tuple[str, str, asyncio.Future]:
+    """
+    Validate a cover image and start uploading it.
+
+    Args:
+        cover_image (UploadFile): Image to upload
+
+    Returns:
+        tuple[str, str, asyncio.Future]: Public URL of the image, its object
+            path in the bucket, and the pending upload, which callers must
+            await before relying on the URL
+
+    Raises:
+        HTTPException: If the image is missing, too large or unsupported
+    """
     # image_url = upload_cover_image(cover_image)
     if not cover_image:
         raise HTTPException(status_code=400, detail="No cover image provided")
 
-    # Validate file size (Max 5MB)
-    if size > 5 * MB:
-        raise HTTPException(status_code=400, detail="Cover image is too large")
+    # Validate file size (Max 5MB) from the spooled upload, without reading it
+    if await upload_size(cover_image) > MAX_COVER_IMAGE_SIZE:
+        raise HTTPException(status_code=413, detail="Cover image is too large")
 
-        # Validate file format
+    # Validate file format
     format = cover_image.content_type
     if format not in SUPPORTED_IMAGE_FORMATS:
         raise HTTPException(status_code=400, detail="Unsupported image format")
 
-    # Validate file type using magic
-    file_type = magic.from_buffer(content, mime=True)
+    # Validate file type from its signature bytes
+    file_type = sniff_image_type(await cover_image.read(SNIFF_SIZE))
+    await cover_image.seek(0)
     if file_type not in SUPPORTED_IMAGE_FORMATS:
         raise HTTPException(status_code=400, detail="Unsupported image format")
 
@@ -42,8 +74,12 @@ async def Uploader(cover_image):
     file_extension = SUPPORTED_IMAGE_FORMATS[format]
     filename = f"{uuid.uuid4()}.{file_extension}"
 
-    # Upload to Supabase Storage and get the URL
-    public_url = await supabase_upload_signed(
-        content=content, filename=filename, content_type=format
+    # The object path is known up front, so its public URL can be handed
+    # out while the upload is still in flight
+    public_url = get_public_url(filename)
+    upload_task = asyncio.ensure_future(
+        supabase_upload_signed(
+            file=cover_image.file, filename=filename, content_type=format
+        )
     )
-    return public_url
+    return public_url, filename, upload_task
@@ -0,0 +1,23 @@
+from typing import Optional
+
+
+def sniff_image_type(data: bytes) -> Optional[str]:
+    """
+    Identify a supported image format from its file signature.
+
+    Only JPEG, PNG and WebP are accepted for uploads, so checking their
+    magic bytes is enough and avoids a libmagic database walk.
+
+    Args:
+        data (bytes): File content, or at least its first 12 bytes
+
+    Returns:
+        Optional[str]: MIME type of the image, or None if unrecognised
+    """
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return None
@@ -1,39 +1,86 @@
-from app.config import supabase, BUCKET
+import os
+from typing import BinaryIO
+
+import httpx
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from app.config import supabase
 
 BUCKET = "cover-images"
-print(f"###########################{BUCKET}")
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Cover images are capped at 5MB; the default 5s timeout is too tight for
+# that on a slow link, and a failed upload rolls back the new goal
+UPLOAD_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+
+def get_public_url(filename: str) -> str:
+    """
+    Build the public URL of a file in the bucket; no request is made.
+    """
+    return supabase.storage.from_(BUCKET).get_public_url(path=filename)
 
 
 async def supabase_upload_signed(
-    content: bytes, filename: str, content_type: str
+    file: BinaryIO, filename: str, content_type: str
 ):
     """
     Uploads a file to Supabase Storage using a signed URL and returns the public URL.
+
+    The file is streamed in chunks rather than loaded into memory, and the
+    blocking calls run in a worker thread.
     """
+    return await run_in_threadpool(_upload_signed, file, filename, content_type)
+
+
+async def supabase_remove(filename: str):
+    """
+    Removes a file from the bucket, running the blocking call in a worker
+    thread.
+    """
+    bucket = supabase.storage.from_(BUCKET)
+    return await run_in_threadpool(bucket.remove, [filename])
+
+
+def _iter_chunks(file: BinaryIO):
+    while chunk := file.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+def _upload_signed(file: BinaryIO, filename: str, content_type: str) -> str:
+    # Bind the bucket once for the storage calls
+    bucket = supabase.storage.from_(BUCKET)
+
     # Step 1: Create a signed upload URL
-    signed_url_response = supabase.storage.from_(
-        BUCKET
-    ).create_signed_upload_url(path=filename)
+    signed_url_response = bucket.create_signed_upload_url(path=filename)
 
-    if not signed_url_response or "token" not in signed_url_response:
+    if not signed_url_response or "signed_url" not in signed_url_response:
         raise HTTPException(
             status_code=500, detail="Failed to generate signed URL"
         )
 
-    token = signed_url_response["token"]
-
-    # Step 2: Upload the file using the signed URL
-    response = supabase.storage.from_(BUCKET).upload_to_signed_url(
-        path=filename,
-        token=token,
-        file=content,  # Only required parameters
+    # Step 2: Stream the file to the signed URL; an explicit length avoids
+    # chunked transfer encoding
+    size = file.seek(0, os.SEEK_END)
+    file.seek(0)
+    response = httpx.put(
+        signed_url_response["signed_url"],
+        content=_iter_chunks(file),
+        # cache-control and x-upsert match what storage3's
+        # upload_to_signed_url sent
+        headers={
+            "content-type": content_type,
+            "content-length": str(size),
+            "cache-control": "max-age=3600",
+            "x-upsert": "false",
+        },
+        timeout=UPLOAD_TIMEOUT,
     )
 
-    if not response:
+    if response.is_error:
         raise HTTPException(status_code=500, detail="Failed to upload file")
 
     # Step 3: Generate the public URL
-    public_url = supabase.storage.from_(BUCKET).get_public_url(path=filename)
+    public_url = bucket.get_public_url(path=filename)
 
     return public_url